@@ -1,7 +1,12 @@
+import atexit
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from os import getenv
-from typing import Union, Dict, List
+from threading import Event, Lock
+from typing import Any, Deque, Optional, Union, Dict, List, Tuple
 
-from httpx import Response
+from httpx import Client as HttpxClient, Limits, Response
+from pydantic import BaseModel
 
 from phi.api.api import api, invalid_response
 from phi.api.routes import ApiRoutes
@@ -13,66 +18,146 @@ from phi.constants import PHI_API_KEY_ENV_VAR, PHI_WS_KEY_ENV_VAR
 from phi.cli.settings import phi_cli_settings
 from phi.utils.log import logger
 
+# Client reused by the sync functions below so consecutive posts share a kept-alive connection
+_client: Optional[HttpxClient] = None
+_client_lock = Lock()
 
-def create_assistant_run(run: AssistantRunCreate) -> bool:
-    if not phi_cli_settings.api_enabled:
-        return True
 
-    logger.debug("--o-o-- Creating Assistant Run")
-    with api.AuthenticatedClient() as api_client:
-        try:
-            r: Response = api_client.post(
-                ApiRoutes.ASSISTANT_RUN_CREATE,
-                headers={
-                    "Authorization": f"Bearer {getenv(PHI_API_KEY_ENV_VAR)}",
-                    "PHI-WORKSPACE": f"{getenv(PHI_WS_KEY_ENV_VAR)}",
-                },
-                json={
-                    "run": run.model_dump(exclude_none=True),
-                    # "workspace": assistant_workspace.model_dump(exclude_none=True),
-                },
+def _get_client() -> HttpxClient:
+    global _client
+
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = HttpxClient(
+                base_url=phi_cli_settings.api_url,
+                headers=api.authenticated_headers,
+                timeout=5,
+                limits=Limits(max_keepalive_connections=8),
             )
-            if invalid_response(r):
-                return False
+        return _client
+
+
+def close_client() -> None:
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
 
-            response_json: Union[Dict, List] = r.json()
-            if response_json is None:
-                return False
+def _post(route: str, key: str, data: Dict[str, Any]) -> bool:
+    """Posts {key: data} to the route, returns True if the API accepted it"""
+    try:
+        r: Response = _get_client().post(
+            route,
+            headers={
+                "Authorization": f"Bearer {getenv(PHI_API_KEY_ENV_VAR)}",
+                "PHI-WORKSPACE": f"{getenv(PHI_WS_KEY_ENV_VAR)}",
+            },
+            json={key: data},
+        )
+        if invalid_response(r):
+            logger.debug(f"Could not post to {route}: {r.status_code}")
+            return False
 
-            logger.debug(f"Response: {response_json}")
-            return True
-        except Exception as e:
-            logger.debug(f"Could not create assistant run: {e}")
+        response_json: Union[Dict, List] = r.json()
+        if response_json is None:
+            return False
+
+        logger.debug(f"Response: {response_json}")
+        return True
+    except Exception as e:
+        logger.debug(f"Could not post to {route}: {e}")
     return False
 
 
+def create_assistant_run(run: AssistantRunCreate) -> bool:
+    if not phi_cli_settings.api_enabled:
+        return True
+
+    logger.debug("--o-o-- Creating Assistant Run")
+    return _post(ApiRoutes.ASSISTANT_RUN_CREATE, "run", run.model_dump(exclude_none=True))
+
+
 def create_assistant_event(event: AssistantEventCreate) -> bool:
     if not phi_cli_settings.api_enabled:
         return True
 
     logger.debug("--o-o-- Creating Assistant Event")
-    with api.AuthenticatedClient() as api_client:
+    return _post(ApiRoutes.ASSISTANT_EVENT_CREATE, "event", event.model_dump(exclude_none=True))
+
+
+# -*- Queued Assistant runs and events
+# Runs and events are queued and posted by a background worker, so logging does not block the Assistant.
+# The queue is flushed QUEUE_FLUSH_INTERVAL seconds after the first item is queued, or as soon as it has
+# QUEUE_FLUSH_SIZE items. Items are serialized when they are queued, so later changes to the objects they
+# reference are not posted, and the worker posts them using a single client.
+QUEUE_FLUSH_INTERVAL = 0.5
+QUEUE_FLUSH_SIZE = 16
+_queue: Deque[Tuple[str, str, Dict[str, Any]]] = deque()
+_queue_lock = Lock()
+_queue_full = Event()
+_queue_flush_scheduled = False
+_queue_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="phi-monitoring")
+
+
+def queue_assistant_run(run: AssistantRunCreate) -> None:
+    _enqueue(ApiRoutes.ASSISTANT_RUN_CREATE, "run", run)
+
+
+def queue_assistant_event(event: AssistantEventCreate) -> None:
+    _enqueue(ApiRoutes.ASSISTANT_EVENT_CREATE, "event", event)
+
+
+def _enqueue(route: str, key: str, item: BaseModel) -> None:
+    global _queue_flush_scheduled
+
+    if not phi_cli_settings.api_enabled:
+        return
+
+    data = item.model_dump(exclude_none=True)
+    with _queue_lock:
+        _queue.append((route, key, data))
+        schedule_flush = not _queue_flush_scheduled
+        _queue_flush_scheduled = True
+        queue_full = len(_queue) >= QUEUE_FLUSH_SIZE
+    if queue_full:
+        _queue_full.set()
+    if schedule_flush:
         try:
-            r: Response = api_client.post(
-                ApiRoutes.ASSISTANT_EVENT_CREATE,
-                headers={
-                    "Authorization": f"Bearer {getenv(PHI_API_KEY_ENV_VAR)}",
-                    "PHI-WORKSPACE": f"{getenv(PHI_WS_KEY_ENV_VAR)}",
-                },
-                json={
-                    "event": event.model_dump(exclude_none=True),
-                    # "workspace": assistant_workspace.model_dump(exclude_none=True),
-                },
-            )
-            if invalid_response(r):
-                return False
+            _queue_executor.submit(_flush_when_ready)
+        except RuntimeError:
+            # The executor is shut down when the interpreter exits, the atexit hook posts the remaining items
+            pass
 
-            response_json: Union[Dict, List] = r.json()
-            if response_json is None:
-                return False
 
-            logger.debug(f"Response: {response_json}")
-            return True
-        except Exception as e:
-            logger.debug(f"Could not create assistant event: {e}")
-    return False
+def _flush_when_ready() -> None:
+    global _queue_flush_scheduled
+
+    _queue_full.wait(QUEUE_FLUSH_INTERVAL)
+    _queue_full.clear()
+    with _queue_lock:
+        _queue_flush_scheduled = False
+    flush_assistant_queue()
+
+
+def flush_assistant_queue() -> None:
+    """Posts all queued Assistant runs and events"""
+    with _queue_lock:
+        items = list(_queue)
+        _queue.clear()
+    if len(items) == 0:
+        return
+
+    logger.debug(f"--o-o-- Posting {len(items)} queued Assistant runs and events")
+    for route, key, data in items:
+        _post(route, key, data)
+
+
+def _shutdown() -> None:
+    flush_assistant_queue()
+    close_client()
+
+
+atexit.register(_shutdown)
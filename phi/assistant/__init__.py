@@ -9,4 +9,5 @@ from phi.assistant.assistant import (
     Tool,
     Toolkit,
     Message,
+    NameCache,
 )
@@ -0,0 +1,70 @@
+from math import sqrt
+from time import monotonic
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+from phi.embedder import Embedder
+from phi.utils.log import logger
+
+
+class NameCache(BaseModel):
+    """Caches generated run names by an embedding of the conversation they were generated for.
+
+    A name is reused for a new conversation if the conversations are similar enough, skipping the LLM call.
+    """
+
+    # Embedder used to embed the conversations
+    embedder: Embedder
+    # Minimum cosine similarity for a cached name to be reused
+    similarity_threshold: float = 0.92
+    # Number of seconds a cached name is kept. None keeps names until they are evicted by max_size.
+    ttl: Optional[float] = 3600
+    # Maximum number of names to keep
+    max_size: int = 256
+
+    # Cached (normalized embedding, name, time added) entries, oldest first: DO NOT SET MANUALLY
+    _entries: List[Tuple[List[float], str, float]] = []
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def embed(self, conversation: str) -> Optional[List[float]]:
+        """Returns the normalized embedding for the conversation, or None if it could not be embedded"""
+        try:
+            embedding = self.embedder.get_embedding(conversation)
+        except Exception as e:
+            logger.warning(f"Failed to embed conversation for the name cache: {e}")
+            return None
+        norm = sqrt(sum(x * x for x in embedding))
+        if norm == 0:
+            return None
+        return [x / norm for x in embedding]
+
+    def get(self, embedding: List[float]) -> Optional[str]:
+        """Returns the cached name for the most similar conversation, if it is similar enough"""
+        self._remove_expired()
+        best_name: Optional[str] = None
+        best_similarity = self.similarity_threshold
+        for cached_embedding, name, _ in self._entries:
+            # Both embeddings are normalized, so the dot product is the cosine similarity
+            similarity = sum(a * b for a, b in zip(embedding, cached_embedding))
+            if similarity >= best_similarity:
+                best_name, best_similarity = name, similarity
+        if best_name is not None:
+            logger.debug(f"Using cached name: {best_name} (similarity: {best_similarity:.4f})")
+        return best_name
+
+    def add(self, embedding: List[float], name: str) -> None:
+        self._entries.append((embedding, name, monotonic()))
+        if len(self._entries) > self.max_size:
+            del self._entries[: len(self._entries) - self.max_size]
+
+    def clear(self) -> None:
+        self._entries = []
+
+    def _remove_expired(self) -> None:
+        if self.ttl is None or len(self._entries) == 0:
+            return
+        expires_before = monotonic() - self.ttl
+        if self._entries[0][2] < expires_before:
+            self._entries = [entry for entry in self._entries if entry[2] >= expires_before]
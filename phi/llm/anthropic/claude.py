@@ -113,16 +113,19 @@ class Claude(LLM):
         api_kwargs: Dict[str, Any] = self.api_kwargs
         api_messages: List[dict] = []
         system_messages: List[str] = []
+        system_cache_control: Optional[Dict[str, Any]] = {"type": "ephemeral"} if self.cache_system_prompt else None
 
         for idx, message in enumerate(messages):
             if message.role == "system" or (message.role != "user" and idx in [0, 1]):
                 system_messages.append(message.content)  # type: ignore
+                if message.cache_control is not None:
+                    system_cache_control = message.cache_control
             else:
                 api_messages.append({"role": message.role, "content": message.content or ""})
 
-        if self.cache_system_prompt:
+        if system_cache_control is not None:
             api_kwargs["system"] = [
-                {"type": "text", "text": " ".join(system_messages), "cache_control": {"type": "ephemeral"}}
+                {"type": "text", "text": " ".join(system_messages), "cache_control": system_cache_control}
             ]
             api_kwargs["extra_headers"] = {"anthropic-beta": "prompt-caching-2024-07-31"}
         else:
@@ -141,16 +144,19 @@ class Claude(LLM):
         api_kwargs: Dict[str, Any] = self.api_kwargs
         api_messages: List[dict] = []
         system_messages: List[str] = []
+        system_cache_control: Optional[Dict[str, Any]] = {"type": "ephemeral"} if self.cache_system_prompt else None
 
         for idx, message in enumerate(messages):
             if message.role == "system" or (message.role != "user" and idx in [0, 1]):
                 system_messages.append(message.content)  # type: ignore
+                if message.cache_control is not None:
+                    system_cache_control = message.cache_control
             else:
                 api_messages.append({"role": message.role, "content": message.content or ""})
 
-        if self.cache_system_prompt:
+        if system_cache_control is not None:
             api_kwargs["system"] = [
-                {"type": "text", "text": " ".join(system_messages), "cache_control": {"type": "ephemeral"}}
+                {"type": "text", "text": " ".join(system_messages), "cache_control": system_cache_control}
             ]
             api_kwargs["extra_headers"] = {"anthropic-beta": "prompt-caching-2024-07-31"}
         else:
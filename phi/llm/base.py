@@ -1,4 +1,5 @@
-from typing import List, Iterator, Optional, Dict, Any, Callable, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Iterator, Optional, Dict, Any, Callable, Union, Tuple
 
 from pydantic import BaseModel, ConfigDict
 
@@ -38,6 +39,9 @@ class LLM(BaseModel):
     show_tool_calls: Optional[bool] = None
     # Maximum number of tool calls allowed.
     tool_call_limit: Optional[int] = None
+    # If True, runs the tool calls from a single response concurrently in threads.
+    # Results are still returned in the order the tool calls were made.
+    run_tools_concurrently: bool = False
 
     # -*- Functions available to the LLM to call -*-
     # Functions extracted from the tools.
@@ -156,17 +160,25 @@ class LLM(BaseModel):
         self.tool_choice = "none"
 
     def run_function_calls(self, function_calls: List[FunctionCall], role: str = "tool") -> List[Message]:
-        function_call_results: List[Message] = []
-        for function_call in function_calls:
-            if self.function_call_stack is None:
-                self.function_call_stack = []
-
-            # -*- Run function call
-            _function_call_timer = Timer()
-            _function_call_timer.start()
-            function_call_success = function_call.execute()
-            _function_call_timer.stop()
+        if self.function_call_stack is None:
+            self.function_call_stack = []
+
+        # -*- Run function calls
+        if self.run_tools_concurrently and len(function_calls) > 1:
+            # Only run the function calls allowed by the function call limit
+            if self.tool_call_limit:
+                function_calls = function_calls[: max(self.tool_call_limit - len(self.function_call_stack), 1)]
+            with ThreadPoolExecutor(max_workers=len(function_calls)) as executor:
+                executed = list(executor.map(self._execute_function_call, function_calls))
+        else:
+            executed = []
+            for function_call in function_calls:
+                executed.append(self._execute_function_call(function_call))
+                if self.tool_call_limit and len(self.function_call_stack) + len(executed) >= self.tool_call_limit:
+                    break
 
+        function_call_results: List[Message] = []
+        for function_call, (function_call_success, elapsed) in zip(function_calls, executed):
             content = function_call.result if function_call_success else function_call.error
             if isinstance(content, BaseModel):
                 content = content.model_dump_json()
@@ -177,23 +189,30 @@ class LLM(BaseModel):
                 tool_call_id=function_call.call_id,
                 tool_call_name=function_call.function.name,
                 tool_call_error=not function_call_success,
-                metrics={"time": _function_call_timer.elapsed},
+                metrics={"time": elapsed},
             )
             if "tool_call_times" not in self.metrics:
                 self.metrics["tool_call_times"] = {}
             if function_call.function.name not in self.metrics["tool_call_times"]:
                 self.metrics["tool_call_times"][function_call.function.name] = []
-            self.metrics["tool_call_times"][function_call.function.name].append(_function_call_timer.elapsed)
+            self.metrics["tool_call_times"][function_call.function.name].append(elapsed)
             function_call_results.append(_function_call_result)
             self.function_call_stack.append(function_call)
 
-            # -*- Check function call limit
-            if self.tool_call_limit and len(self.function_call_stack) >= self.tool_call_limit:
-                self.deactivate_function_calls()
-                break  # Exit early if we reach the function call limit
+        # -*- Check function call limit
+        if self.tool_call_limit and len(self.function_call_stack) >= self.tool_call_limit:
+            self.deactivate_function_calls()
 
         return function_call_results
 
+    def _execute_function_call(self, function_call: FunctionCall) -> Tuple[bool, float]:
+        """Executes a function call and returns (success, time taken)"""
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        function_call_success = function_call.execute()
+        _function_call_timer.stop()
+        return function_call_success, _function_call_timer.elapsed
+
     def get_system_prompt_from_llm(self) -> Optional[str]:
         return self.system_prompt
 
@@ -29,6 +29,9 @@ class Message(BaseModel):
     metrics: Dict[str, Any] = {}
     # Internal identifier for the message.
     internal_id: Optional[str] = None
+    # Marks the message as a prompt cache breakpoint, eg: {"type": "ephemeral"}.
+    # Note: Only used by LLMs that support prompt caching and is not sent to other LLM APIs.
+    cache_control: Optional[Dict[str, Any]] = None
 
     # DEPRECATED: The name and arguments of a function that should be called, as generated by the model.
     function_call: Optional[Dict[str, Any]] = None
@@ -47,7 +50,7 @@ class Message(BaseModel):
 
     def to_dict(self) -> Dict[str, Any]:
         _dict = self.model_dump(
-            exclude_none=True, exclude={"metrics", "tool_call_name", "internal_id", "tool_call_error"}
+            exclude_none=True, exclude={"metrics", "tool_call_name", "internal_id", "tool_call_error", "cache_control"}
         )
         # Manually add the content field if it is None
         if self.content is None:
@@ -1,6 +1,5 @@
 from typing import List, Dict, Optional
 
-from phi.api.prompt import sync_prompt_registry_api, sync_prompt_template_api
 from phi.api.schemas.prompt import (
     PromptRegistrySync,
     PromptTemplatesSync,
@@ -74,6 +73,8 @@ class PromptRegistry:
         logger.debug(f"Updated prompt: {id}")
 
     def sync_registry(self):
+        from phi.api.prompt import sync_prompt_registry_api
+
         logger.debug(f"Syncing registry with phidata: {self.name}")
         self._remote_registry, self._remote_templates = sync_prompt_registry_api(
             registry=PromptRegistrySync(registry_name=self.name),
@@ -103,6 +104,8 @@ class PromptRegistry:
         )
 
         if needs_sync:
+            from phi.api.prompt import sync_prompt_template_api
+
             _prompt_template: Optional[PromptTemplateSchema] = sync_prompt_template_api(
                 registry=PromptRegistrySync(registry_name=self.name),
                 prompt_template=PromptTemplateSync(template_id=id, template_data=prompt.model_dump(exclude_none=True)),
@@ -1,10 +1,28 @@
 import json
+import re
 from datetime import datetime, date
 from pathlib import Path
-from typing import Optional, Dict, Union, List
+from typing import Any, Optional, Dict, Union, List
 
 from phi.utils.log import logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+# Matches a number in exponent notation, which orjson and json format differently
+_JSON_EXPONENT = re.compile(r"\d[eE][+-]?\d")
+# Types json does not serialize like orjson are passed through, so orjson raises a TypeError and json is used
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_SUBCLASS
+    if orjson is not None
+    else 0
+)
+
 
 class CustomJSONEncoder(json.JSONEncoder):
     def default(self, o):
@@ -17,6 +35,24 @@ class CustomJSONEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
+def dumps_json(data: Any, indent: Optional[int] = None) -> str:
+    """Serialize data to a JSON string, the same as json.dumps(data, indent=indent).
+
+    If orjson is installed it is used for an indent of 2, where its output matches json for ASCII text.
+    Output that could differ (non-ASCII text, floats in exponent notation, null for NaN and Infinity) and
+    datetimes, dataclasses and subclasses of str, int, dict and list, which json does not serialize the same way,
+    are serialized using json. Note: orjson also serializes UUIDs and Enums, which json.dumps rejects.
+    """
+    if orjson is not None and indent == 2:
+        try:
+            _json = orjson.dumps(data, option=_ORJSON_OPTIONS).decode()
+            if _json.isascii() and "null" not in _json and _JSON_EXPONENT.search(_json) is None:
+                return _json
+        except TypeError:
+            pass
+    return json.dumps(data, indent=indent)
+
+
 def read_json_file(file_path: Optional[Path]) -> Optional[Union[Dict, List]]:
     if file_path is not None and file_path.exists() and file_path.is_file():
         # logger.debug(f"Reading {file_path}")